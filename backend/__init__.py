@@ -1,34 +1,63 @@
+import atexit
 import os
 import logging
-from flask import Flask, jsonify, send_from_directory
-from flask_cors import CORS
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+from quart import Quart, jsonify, send_from_directory
+from quart_cors import cors
+from quart_rate_limiter import RateLimiter
 from dotenv import load_dotenv
 from werkzeug.exceptions import HTTPException
 
 from .auth import auth_bp
+from .cache import FailOpenRedisStore, close_cache
 from .config import Config
 from .db import init_app as init_db
 from .detect import detect_bp
+from .json_provider import OrjsonProvider
 
 
 BASE_DIR = os.path.abspath(os.path.dirname(__file__))
 
 
-def create_app() -> Flask:
+class _DeferredQueueHandler(QueueHandler):
+    """Queue records as-is so message and traceback formatting run on the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _configure_logging() -> None:
+    """Route root logging through a queue so request handlers never format or write logs."""
+    if logging.getLogger().handlers:
+        return
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    stream = logging.StreamHandler()
+    stream.setFormatter(
+        logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    )
+    listener = QueueListener(log_queue, stream)
+    listener.start()
+    atexit.register(listener.stop)
+
+    logging.basicConfig(level=logging.INFO, handlers=[_DeferredQueueHandler(log_queue)])
+
+
+def create_app() -> Quart:
     load_dotenv(os.path.join(BASE_DIR, ".env"))
     settings = Config.load()
 
-    app = Flask(
+    app = Quart(
         __name__,
         static_folder=os.path.abspath(os.path.join(BASE_DIR, "..", "frontend", "dist")),
         static_url_path="/",
     )
+    app.json = OrjsonProvider(app)
 
     # Configure logging
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    )
+    _configure_logging()
 
     database_path = settings.database or os.path.join(app.instance_path, "app.sqlite")
     app.config.update(
@@ -36,18 +65,28 @@ def create_app() -> Flask:
         DATABASE=database_path,
         GEMINI_API_KEY=settings.gemini_api_key,
         TAVILY_API_KEY=settings.tavily_api_key,
+        REDIS_URL=settings.redis_url,
+        SEMANTIC_CACHE_THRESHOLD=settings.semantic_cache_threshold,
         PORT=settings.port,
         TIMEOUT=settings.timeout,
+        TRUSTED_PROXIES=settings.trusted_proxies,
     )
 
     os.makedirs(app.instance_path, exist_ok=True)
 
-    CORS(
+    app = cors(
         app,
-        resources={r"/api/*": {"origins": settings.cors_origins}},
-        supports_credentials=True,
+        allow_origin=settings.cors_origins,
+        allow_credentials=True,
+        expose_headers=["Retry-After", "X-Cache"],
     )
     init_db(app)
+    app.after_serving(close_cache)
+    # Share limiter state across workers when Redis is available. The store
+    # also holds the per-user claim budget charged by the detection routes.
+    app.extensions["rate_limiter"] = RateLimiter(
+        app, store=FailOpenRedisStore(settings.redis_url) if settings.redis_url else None
+    )
 
     app.register_blueprint(auth_bp)
     app.register_blueprint(detect_bp)
@@ -55,24 +94,26 @@ def create_app() -> Flask:
     # Error handlers
     @app.errorhandler(HTTPException)
     def handle_http_exception(e):
-        return jsonify({"error": e.description}), e.code
+        # Keep headers such as Retry-After; the body is JSON, not werkzeug's HTML
+        headers = [(k, v) for k, v in e.get_headers() if k.lower() != "content-type"]
+        return jsonify({"error": e.description}), e.code, headers
 
     @app.errorhandler(Exception)
     def handle_exception(e):
-        app.logger.error(f"Unhandled exception: {str(e)}", exc_info=True)
+        app.logger.error("Unhandled exception: %s", type(e).__name__, exc_info=e)
         return jsonify({"error": "Internal server error"}), 500
 
     @app.route("/", defaults={"path": ""})
     @app.route("/<path:path>")
-    def root(path: str):
+    async def root(path: str):
         if path.startswith("api/") or path.startswith("partials/"):
             return jsonify({"error": "Not found"}), 404
 
         file_path = os.path.join(app.static_folder, path)
         if os.path.isfile(file_path):
-            return send_from_directory(app.static_folder, path)
+            return await send_from_directory(app.static_folder, path)
 
-        return send_from_directory(app.static_folder, "index.html")
+        return await send_from_directory(app.static_folder, "index.html")
 
     @app.route("/health")
     def health():
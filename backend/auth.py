@@ -1,6 +1,7 @@
 from functools import wraps
 
-from flask import Blueprint, jsonify, g, request, session
+from quart import Blueprint, current_app, jsonify, g, request, session
+from quart.utils import run_sync
 from werkzeug.security import check_password_hash, generate_password_hash
 
 from .db import get_db
@@ -26,31 +27,23 @@ def load_user():
 
 def login_required(fn):
     @wraps(fn)
-    def wrapped(*args, **kwargs):
+    async def wrapped(*args, **kwargs):
         if g.get("user") is None:
             return jsonify({"error": "Authentication required"}), 401
-        return fn(*args, **kwargs)
+        # ensure_async lets the decorator wrap both plain and async views
+        return await current_app.ensure_async(fn)(*args, **kwargs)
 
     return wrapped
 
 
-@auth_bp.post("/api/signup")
-def signup():
-    data = request.get_json(silent=True) or {}
-    username = (data.get("username") or "").strip()
-    password = data.get("password") or ""
-
-    if len(username) < 3:
-        return jsonify({"error": "Username must be at least 3 characters"}), 400
-    if len(password) < 6:
-        return jsonify({"error": "Password must be at least 6 characters"}), 400
-
+def _create_user(username: str, password: str) -> int | None:
+    """Insert a user and return its id, or None when the username is taken."""
     db = get_db()
     exists = db.execute(
         "SELECT 1 FROM users WHERE username = ?", (username,)
     ).fetchone()
     if exists:
-        return jsonify({"error": "Username already taken"}), 409
+        return None
 
     password_hash = generate_password_hash(password)
     db.execute(
@@ -58,30 +51,56 @@ def signup():
         (username, password_hash),
     )
     db.commit()
-    user_id = db.execute("SELECT last_insert_rowid()").fetchone()[0]
+    return db.execute("SELECT last_insert_rowid()").fetchone()[0]
+
+
+def _check_credentials(username: str, password: str):
+    """Return the user row when the password matches, else None."""
+    user = (
+        get_db()
+        .execute(
+            "SELECT id, username, password_hash FROM users WHERE username = ?",
+            (username,),
+        )
+        .fetchone()
+    )
+    if not user or not check_password_hash(user["password_hash"], password):
+        return None
+    return user
+
+
+# The views await the request body, then hand password hashing (scrypt) and
+# sqlite to Quart's thread pool so they do not stall the worker's event loop.
+@auth_bp.post("/api/signup")
+async def signup():
+    data = await request.get_json(silent=True) or {}
+    username = (data.get("username") or "").strip()
+    password = data.get("password") or ""
+
+    if len(username) < 3:
+        return jsonify({"error": "Username must be at least 3 characters"}), 400
+    if len(password) < 6:
+        return jsonify({"error": "Password must be at least 6 characters"}), 400
+
+    user_id = await run_sync(_create_user)(username, password)
+    if user_id is None:
+        return jsonify({"error": "Username already taken"}), 409
     session["user_id"] = user_id
 
     return jsonify({"id": user_id, "username": username})
 
 
 @auth_bp.post("/api/login")
-def login():
-    data = request.get_json(silent=True) or {}
+async def login():
+    data = await request.get_json(silent=True) or {}
     username = (data.get("username") or "").strip()
     password = data.get("password") or ""
 
     if not username or not password:
         return jsonify({"error": "Username and password are required"}), 400
 
-    user = (
-        get_db()
-        .execute(
-            "SELECT id, username, password_hash FROM users WHERE username = ?",
-            (username,),
-        )
-        .fetchone()
-    )
-    if not user or not check_password_hash(user["password_hash"], password):
+    user = await run_sync(_check_credentials)(username, password)
+    if user is None:
         return jsonify({"error": "Invalid credentials"}), 401
 
     session["user_id"] = user["id"]
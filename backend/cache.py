@@ -0,0 +1,109 @@
+import hashlib
+import logging
+from datetime import datetime, timezone
+from math import ceil
+from typing import Any, List, Optional
+
+import redis
+import redis.asyncio
+from quart import current_app
+from quart_rate_limiter.redis_store import RedisStore
+
+# Global client (lazy initialized); None while REDIS_URL is unset
+_redis_client: Optional[redis.asyncio.Redis] = None
+
+# Seconds to wait on Redis before giving up, so an unreachable or stalled
+# server costs a live detection rather than a hung request
+_SOCKET_TIMEOUT = 0.5
+
+logger = logging.getLogger(__name__)
+
+
+def get_cache() -> Optional[redis.asyncio.Redis]:
+    """Return the shared Redis client, or None when caching is disabled."""
+    global _redis_client
+    url = current_app.config.get("REDIS_URL")
+    if not url:
+        return None
+    if _redis_client is None:
+        _redis_client = redis.asyncio.Redis.from_url(
+            url, socket_timeout=_SOCKET_TIMEOUT, socket_connect_timeout=_SOCKET_TIMEOUT
+        )
+    return _redis_client
+
+
+def cache_key(prefix: str, text: str) -> str:
+    """Build a cache key from the SHA-256 of the normalized text."""
+    digest = hashlib.sha256(text.strip().casefold().encode()).hexdigest()
+    return f"{prefix}{digest}"
+
+
+async def cache_get(key: str) -> Optional[bytes]:
+    """Fetch a cached value. Cache failures are logged and treated as misses."""
+    client = get_cache()
+    if client is None:
+        return None
+    try:
+        return await client.get(key)
+    except redis.RedisError as exc:
+        logger.warning("Cache read failed: %s", exc)
+        return None
+
+
+async def cache_get_many(keys: List[str]) -> List[Optional[bytes]]:
+    """Fetch several cached values in one round-trip. Failures count as misses."""
+    client = get_cache()
+    if client is None or not keys:
+        return [None] * len(keys)
+    try:
+        return await client.mget(keys)
+    except redis.RedisError as exc:
+        logger.warning("Cache read failed: %s", exc)
+        return [None] * len(keys)
+
+
+async def cache_set(key: str, value: bytes | str, ttl: int) -> None:
+    """Store a value with a TTL in seconds. Failures are logged and ignored."""
+    client = get_cache()
+    if client is None:
+        return
+    try:
+        await client.set(key, value, ex=ttl)
+    except redis.RedisError as exc:
+        logger.warning("Cache write failed: %s", exc)
+
+
+async def close_cache() -> None:
+    """Close the shared Redis connection pool on shutdown."""
+    global _redis_client
+    if _redis_client is not None:
+        await _redis_client.aclose()
+        _redis_client = None
+
+
+class FailOpenRedisStore(RedisStore):
+    """
+    Rate-limit store that, like the response cache, treats Redis failures as
+    misses: the request is let through and a warning is logged. Keys expire
+    once their TAT has passed, since an old TAT no longer limits anything.
+    """
+
+    def __init__(self, address: str, **kwargs: Any) -> None:
+        kwargs.setdefault("socket_timeout", _SOCKET_TIMEOUT)
+        kwargs.setdefault("socket_connect_timeout", _SOCKET_TIMEOUT)
+        super().__init__(address, **kwargs)
+
+    async def get(self, key: str, default: datetime) -> datetime:
+        try:
+            return await super().get(key, default)
+        except redis.RedisError as exc:
+            logger.warning("Rate limit read failed: %s", exc)
+            return default
+
+    async def set(self, key: str, tat: datetime) -> None:
+        # The TAT is at most one limit period ahead, so is the expiry
+        ttl_ms = max(1, ceil((tat - datetime.now(timezone.utc)).total_seconds() * 1000))
+        try:
+            await self._redis.set(key, tat.timestamp(), px=ttl_ms)
+        except redis.RedisError as exc:
+            logger.warning("Rate limit write failed: %s", exc)
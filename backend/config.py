@@ -9,9 +9,12 @@ class Config:
     database: str
     gemini_api_key: str | None
     tavily_api_key: str | None
+    redis_url: str | None
     port: int
     timeout: int
     cors_origins: List[str]
+    trusted_proxies: int
+    semantic_cache_threshold: float | None
 
     @classmethod
     def load(cls) -> "Config":
@@ -27,12 +30,17 @@ class Config:
             ]
         )
 
+        threshold = os.getenv("SEMANTIC_CACHE_THRESHOLD")
+
         return cls(
             secret_key=os.getenv("FLASK_SECRET_KEY", "dev-secret-change-me"),
             database=os.getenv("DATABASE_URL"),
             gemini_api_key=os.getenv("GEMINI_API_KEY"),
             tavily_api_key=os.getenv("TAVILY_API_KEY"),
+            redis_url=os.getenv("REDIS_URL"),
             port=int(os.getenv("PORT", 8000)),
             timeout=int(os.getenv("TIMEOUT", 8)),
             cors_origins=cors_origins,
+            trusted_proxies=int(os.getenv("TRUSTED_PROXIES", 0)),
+            semantic_cache_threshold=float(threshold) if threshold else None,
         )
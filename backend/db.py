@@ -1,12 +1,14 @@
 import sqlite3
 from typing import Any
 
-from flask import current_app, g
+from quart import current_app, g
 
 
 def get_db() -> sqlite3.Connection:
     if "db" not in g:
-        g.db = sqlite3.connect(current_app.config["DATABASE"])
+        # Quart runs sync handlers and teardowns on executor threads, so the
+        # per-context connection may be touched by more than one thread.
+        g.db = sqlite3.connect(current_app.config["DATABASE"], check_same_thread=False)
         g.db.row_factory = sqlite3.Row
     return g.db
 
@@ -34,5 +36,6 @@ def init_db() -> None:
 
 def init_app(app: Any) -> None:
     app.teardown_appcontext(close_db)
-    with app.app_context():
-        init_db()
+    # Quart only opens app contexts asynchronously, so the schema is created
+    # when the server starts rather than while the app is being built.
+    app.before_serving(init_db)
@@ -1,27 +1,156 @@
-import json
+import asyncio
+import copy
+import functools
 import logging
-from typing import List, Tuple, Dict, Any, Optional
-
-from flask import Blueprint, current_app, jsonify, request
+import re
+import uuid
+from datetime import datetime, timedelta, timezone
+from math import ceil
+from typing import AsyncIterator, List, Tuple, Dict, Any, Optional
+
+import httpx
+import numpy as np
+import orjson
+from quart import (
+    Blueprint,
+    Response,
+    current_app,
+    g,
+    jsonify,
+    request,
+    session,
+    stream_with_context,
+)
 from google import genai
-from tavily import TavilyClient
+from google.genai import errors as genai_errors
+from google.genai import types
+from quart_rate_limiter import RateLimit, RateLimitExceeded, rate_limit
+from tavily import AsyncTavilyClient, UsageLimitExceededError
 
+from . import semantic
 from .auth import login_required
+from .cache import cache_get, cache_get_many, cache_key, cache_set, get_cache
 
 # Create blueprint for detection routes
 detect_bp = Blueprint("detect", __name__)
 
-# Global clients (lazy initialized)
+# Global clients (lazy initialized). Each worker serves every request on one
+# event loop, so the async clients and their connection pools are shared.
 _gemini_client: Optional[genai.Client] = None
-_tavily_client: Optional[TavilyClient] = None
+_gemini_http: Optional[httpx.AsyncClient] = None
+_tavily_client: Optional[AsyncTavilyClient] = None
+_tavily_http: Optional[httpx.AsyncClient] = None
+
+# Pool sizing for the API clients. httpx drops idle connections after 5s by
+# default, which costs a fresh TLS handshake whenever traffic has a lull.
+_HTTP_LIMITS = httpx.Limits(
+    max_connections=64, max_keepalive_connections=32, keepalive_expiry=60
+)
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
 
+async def _user_key() -> str:
+    """Rate-limit key for the logged-in user; every limited route requires login."""
+    user_id = session.get("user_id")
+    # The limiter also reads this key for the RateLimit-* headers when the
+    # per-user limit was skipped, so requests without a session need one too
+    return f"user:{user_id}" if user_id is not None else await _client_ip()
+
+
+async def _no_session() -> bool:
+    """Requests without a session skip the per-user limit; login_required rejects them."""
+    return session.get("user_id") is None
+
+
+async def _client_ip() -> str:
+    """
+    Rate-limit key for the client address. X-Forwarded-For is set by the
+    client, so only the entry added by the outermost of the TRUSTED_PROXIES
+    proxies we run is used; without proxies it is the socket peer address.
+    """
+    hops = current_app.config["TRUSTED_PROXIES"]
+    if hops and "X-Forwarded-For" in request.headers:
+        route = request.access_route
+        if len(route) >= hops:
+            return route[-hops]
+    return request.remote_addr or ""
+
+
+# Limits on the routes that spend Gemini/Tavily quota, so a single account
+# cannot exhaust the shared API keys for everyone else. The looser per-address
+# limit also covers requests without a session.
+_RATE_LIMITS = [
+    RateLimit(10, timedelta(minutes=1), key_function=_user_key, skip_function=_no_session),
+    RateLimit(30, timedelta(minutes=1), key_function=_client_ip),
+]
+# Each bulk job poll calls Gemini's batches.get while the job is pending
+_POLL_LIMITS = [
+    RateLimit(20, timedelta(minutes=1), key_function=_user_key, skip_function=_no_session),
+    RateLimit(60, timedelta(minutes=1), key_function=_client_ip),
+]
+# Uncached claims a user may send for search and analysis, one budget shared
+# by all four detection routes. The limits above count requests, and each
+# route has its own, so on their own they let a user put 100 claims through
+# every bulk request.
+_CLAIM_BUDGET = RateLimit(200, timedelta(hours=1))
+# Seconds clients are told to wait when Gemini or Tavily rejects us for quota
+_UPSTREAM_RETRY_AFTER = 30
+
+# Words dropped when turning a claim into a compact search query
+_STOPWORDS = frozenset(
+    """
+    a an the and or but if of to in on at by for with from as into about over
+    is are was were be been being am do does did has have had will would shall
+    should can could may might must this that these those it its it's i me my
+    we our you your he him his she her they them their there here what which
+    who whom whose when where why how not no yes so than then too very just
+    also only even ever really said says say claim claims reportedly news
+    """.split()
+)
+_WORD_RE = re.compile(r"[\w'-]+")
+_MAX_QUERY_WORDS = 8
+
+# Tavily snippets are only fed to the prompt (the frontend shows title/URL),
+# so they are cleaned and clipped once when results come in. Snippets that
+# share their opening (syndicated copies of one story) are kept only once.
+_SNIPPET_CHARS = 300
+_FINGERPRINT_CHARS = 128
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
+
+# Cache lifetimes (seconds). Search results go stale faster than verdicts
+# are re-requested, so they are kept separately with a shorter TTL.
+_RESPONSE_TTL = 4 * 3600
+_SEARCH_TTL = 3600
+
+# Claims are headlines or short passages. The cap also bounds the prompts
+# kept by _build_claim_prompt's LRU cache.
+_MAX_CLAIM_CHARS = 2000
+
+# Larger batches stop paying off: the shared prompt grows while the saved
+# per-call overhead stays fixed.
+_MAX_BATCH_CLAIMS = 8
+
+# Bulk jobs go through Gemini Batch Mode, which can take up to a day to
+# finish, so job records outlive it.
+_MAX_BULK_CLAIMS = 100
+_JOB_TTL = 48 * 3600
+_JOB_FAILED_STATES = {
+    types.JobState.JOB_STATE_FAILED,
+    types.JobState.JOB_STATE_CANCELLED,
+    types.JobState.JOB_STATE_EXPIRED,
+}
+_JOB_DONE_STATES = {
+    types.JobState.JOB_STATE_SUCCEEDED,
+    types.JobState.JOB_STATE_PARTIALLY_SUCCEEDED,
+}
+
+
 def _ensure_clients() -> Tuple[bool, Optional[str]]:
     """Initialize API clients if not already active."""
-    global _gemini_client, _tavily_client
+    global _gemini_client, _gemini_http, _tavily_client, _tavily_http
     cfg = current_app.config
     gemini_key = cfg.get("GEMINI_API_KEY")
     tavily_key = cfg.get("TAVILY_API_KEY")
@@ -31,64 +160,148 @@ def _ensure_clients() -> Tuple[bool, Optional[str]]:
 
     try:
         if _gemini_client is None:
-            _gemini_client = genai.Client(api_key=gemini_key)
+            # A prebuilt client makes the SDK use httpx even when aiohttp is
+            # installed, where async_client_args would be passed to aiohttp
+            _gemini_http = httpx.AsyncClient(limits=_HTTP_LIMITS)
+            _gemini_client = genai.Client(
+                api_key=gemini_key,
+                http_options=types.HttpOptions(httpx_async_client=_gemini_http),
+            )
         if _tavily_client is None:
-            _tavily_client = TavilyClient(api_key=tavily_key)
+            _tavily_http = httpx.AsyncClient(limits=_HTTP_LIMITS)
+            _tavily_client = AsyncTavilyClient(api_key=tavily_key, client=_tavily_http)
         return True, None
     except Exception as e:
-        logger.error(f"Client initialization failed: {e}")
-        return False, str(e)
+        logger.error("Client initialization failed: %s", e)
+        return False, f"Client initialization failed: {type(e).__name__}"
+
+
+@detect_bp.after_app_serving
+async def _close_clients() -> None:
+    """Release the shared client connection pools on shutdown."""
+    global _gemini_client, _gemini_http, _tavily_client, _tavily_http
+    if _tavily_http is not None:
+        await _tavily_http.aclose()
+    if _gemini_client is not None:
+        await _gemini_client.aio.aclose()
+    # The SDK leaves a caller-supplied httpx client open
+    if _gemini_http is not None:
+        await _gemini_http.aclose()
+    _gemini_client = _gemini_http = _tavily_client = _tavily_http = None
+
+
+def _clip(text: str) -> str:
+    """Strip markup and collapse whitespace, then cut to the snippet budget."""
+    return _SPACE_RE.sub(" ", _TAG_RE.sub(" ", text)).strip()[:_SNIPPET_CHARS]
+
 
+def _is_rate_limited(exc: Exception) -> bool:
+    """True when Gemini or Tavily rejected the call for rate/quota reasons."""
+    if isinstance(exc, UsageLimitExceededError):
+        return True
+    return isinstance(exc, genai_errors.APIError) and exc.code == 429
 
-def _search_articles(query: str, k: int = 5) -> Tuple[bool, List[Dict[str, str]] | str]:
+
+def _upstream_rate_limited() -> RateLimitExceeded:
+    """429 with Retry-After, so clients back off instead of retrying a 502."""
+    err = RateLimitExceeded(_UPSTREAM_RETRY_AFTER)
+    err.description = "Upstream API rate limit reached, please retry later"
+    return err
+
+
+async def _charge_claims(count: int) -> None:
+    """
+    Charge ``count`` claims to the caller's claim budget, or raise a 429.
+    Uses the same GCRA scheme and store as the request limits, with each
+    claim weighing one request.
+    """
+    if not count:
+        return
+    store = current_app.extensions["rate_limiter"].store
+    key = f"{current_app.import_name}-claims-{_CLAIM_BUDGET.key}-{await _user_key()}"
+    now = datetime.now(timezone.utc)
+    stored = await store.get(key, now)
+    if stored.tzinfo is None:
+        stored = stored.astimezone(timezone.utc)
+    tat = max(stored, now) + timedelta(seconds=count * _CLAIM_BUDGET.inverse)
+    overshoot = (tat - now - _CLAIM_BUDGET.period).total_seconds()
+    if overshoot > 0:
+        err = RateLimitExceeded(int(ceil(overshoot)))
+        err.description = "Claim limit reached, please retry later"
+        raise err
+    await store.set(key, tat)
+
+
+def _local_query(claim: str) -> str:
+    """
+    Build a short keyword query from the claim without an extra model call.
+    When more words survive stopword filtering than fit in the query, names
+    and numbers (capitalized or digit-bearing words) are kept first, since
+    they carry most of the search signal; the original word order is kept.
+    Falls back to the raw claim when nothing survives stopword filtering.
+    """
+    words = [w for w in _WORD_RE.findall(claim) if w.casefold() not in _STOPWORDS]
+    if len(words) > _MAX_QUERY_WORDS:
+        ranked = sorted(
+            range(len(words)),
+            key=lambda i: (not (words[i][0].isupper() or any(c.isdigit() for c in words[i])), i),
+        )
+        words = [words[i] for i in sorted(ranked[:_MAX_QUERY_WORDS])]
+    return " ".join(words) or claim
+
+
+async def _search_articles(query: str, k: int = 5) -> Tuple[bool, List[Dict[str, str]] | str]:
     """Search for articles using Tavily API."""
+    key = cache_key("fnd:search:", query)
+    cached = await cache_get(key)
+    if cached is not None:
+        return True, orjson.loads(cached)
+
     try:
-        res = _tavily_client.search(query, timeout=current_app.config["TIMEOUT"])
-        results = res.get("results", [])[:k]
+        res = await _tavily_client.search(
+            query=query,
+            max_results=k,
+            search_depth="basic",
+            include_answer=False,
+            include_raw_content=False,
+            timeout=current_app.config["TIMEOUT"],
+        )
+        results = res.get("results", [])
 
         # Format sources for both AI analysis and frontend display
         articles = []
+        seen = set()
         for r in results:
             url = r.get("url", "")
             # Ensure URL is valid for frontend display
             if not url or not url.startswith("http"):
                 continue
 
+            content = _clip(r.get("content") or "")
+            fingerprint = content[:_FINGERPRINT_CHARS].casefold()
+            if fingerprint and fingerprint in seen:
+                continue
+            seen.add(fingerprint)
+
             articles.append(
                 {
                     "title": r.get("title", "Unknown Title"),
-                    "content": r.get("content", ""),
+                    "content": content,
                     "url": url,
                     "score": r.get("score", 0),
                 }
             )
 
+        await cache_set(key, orjson.dumps(articles), _SEARCH_TTL)
         return True, articles
     except Exception as exc:
-        logger.error(f"Tavily search error: {exc}")
-        return False, f"Tavily error: {exc}"
+        logger.error("Tavily search error: %s", exc)
+        if _is_rate_limited(exc):
+            raise _upstream_rate_limited() from exc
+        return False, f"Tavily error: {type(exc).__name__}"
 
 
-def _analyze_claim(claim: str, sources: List[Dict[str, str]]) -> Tuple[bool, str]:
-    """
-    Perform single-pass analysis using Gemini.
-    Asks for search query generation (if needed), verification, and explanation in one go
-    to reduce latency and API calls.
-    """
-    try:
-        sources_text = "\n".join(
-            f"{i+1}. [{src['title']}]({src['url']}): {src['content'][:300]}..."
-            for i, src in enumerate(sources)
-        )
-
-        prompt = f"""
-        Analyze the following text against the provided news sources.
-        
-        Claim to Verify: "{claim}"
-        
-        Search Results/Sources:
-        {sources_text}
-        
+_GUIDELINES = """
         STRICT GUIDELINES:
         1. VALIDATION: Determine if the input is a verifiable news-related claim.
            - If it is a greeting, general conversation, or non-factual statement, set 'verdict' to "Out of Scope".
@@ -105,36 +318,300 @@ def _analyze_claim(claim: str, sources: List[Dict[str, str]]) -> Tuple[bool, str
            - 'Insufficient Info': The sources are related but do not confirm or deny the specific details of the claim, or the claim is too vague.
 
         4. CITATION: Cite specific sources by their number (e.g., [1], [2]) in your explanation.
-
-        Response Format (JSON):
-        {{
-            "verdict": "Likely True" | "Likely Fake" | "Insufficient Info" | "Out of Scope",
-            "explanation": "Clear, concise explanation with citations. If vague, ask for more details.",
-            "confidence_score": 0-100
-        }}
+"""
+
+_MODEL = "gemini-2.5-flash-lite"
+# Deterministic output keeps cached verdicts consistent with fresh ones
+_GENERATION_CONFIG = {"response_mime_type": "application/json", "temperature": 0}
+# Output budget per verdict object. A verdict is well under this, so the cap
+# only cuts off runaway generations instead of waiting out the default limit.
+_MAX_VERDICT_TOKENS = 512
+
+# Enforced by Gemini's structured output, so the prompts carry no format spec
+_VERDICT_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "verdict": {
+            "type": "string",
+            "enum": ["Likely True", "Likely Fake", "Insufficient Info", "Out of Scope"],
+        },
+        "explanation": {
+            "type": "string",
+            "description": "Clear, concise explanation with citations. If vague, ask for more details.",
+        },
+        "confidence_score": {"type": "integer", "minimum": 0, "maximum": 100},
+    },
+    "required": ["verdict", "explanation", "confidence_score"],
+    "property_ordering": ["verdict", "explanation", "confidence_score"],
+}
+
+
+# Hashable (title, url, content) form of a source list, for the prompt cache
+_SourceKey = Tuple[Tuple[str, str, str], ...]
+
+
+def _source_key(sources: List[Dict[str, str]]) -> _SourceKey:
+    return tuple((src["title"], src["url"], src["content"]) for src in sources)
+
+
+def _format_sources(sources: _SourceKey) -> str:
+    """Render sources as a numbered list for the analysis prompt."""
+    return "\n".join(
+        f"{i}. [{title}]({url}): {content}..."
+        for i, (title, url, content) in enumerate(sources, start=1)
+    )
+
+
+def _generation_config(verdicts: int = 1) -> Dict[str, Any]:
+    """
+    Generation config for ``verdicts`` verdict objects. A single verdict is
+    returned as an object; several come back as an array tagged by claim number.
+    """
+    schema = _VERDICT_SCHEMA
+    if verdicts > 1:
+        item = {
+            **_VERDICT_SCHEMA,
+            "properties": {"claim_number": {"type": "integer"}, **_VERDICT_SCHEMA["properties"]},
+            "required": ["claim_number", *_VERDICT_SCHEMA["required"]],
+            "property_ordering": ["claim_number", *_VERDICT_SCHEMA["property_ordering"]],
+        }
+        schema = {"type": "array", "items": item, "min_items": verdicts, "max_items": verdicts}
+    return {
+        **_GENERATION_CONFIG,
+        # The SDK normalizes schema dicts in place, so hand it a private copy
+        "response_schema": copy.deepcopy(schema),
+        "max_output_tokens": _MAX_VERDICT_TOKENS * verdicts,
+    }
+
+
+def _json_end(text: str, start: int = 0, depth: int = 0, in_string: bool = False,
+              escaped: bool = False) -> Tuple[int, int, bool, bool]:
+    """
+    Scan ``text`` from ``start`` for the end of the top-level JSON value.
+    Returns the index just past the closing bracket (or -1 if not reached)
+    along with the scanner state, so streamed text can be fed incrementally.
+    """
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            depth += 1
+        elif ch in "}]":
+            depth -= 1
+            if depth == 0:
+                return i + 1, depth, in_string, escaped
+    return -1, depth, in_string, escaped
+
+
+async def _stream_generate(prompt: str, verdicts: int = 1) -> AsyncIterator[str]:
+    """
+    Stream a JSON-mode Gemini request, yielding text as it arrives.
+    The stream is closed as soon as the JSON value is complete, so trailing
+    decode is never waited on.
+    """
+    stream = await _gemini_client.aio.models.generate_content_stream(
+        model=_MODEL, contents=prompt, config=_generation_config(verdicts)
+    )
+    buf = ""
+    depth, in_string, escaped = 0, False, False
+    try:
+        async for chunk in stream:
+            text = chunk.text or ""
+            scanned = len(buf)
+            buf += text
+            end, depth, in_string, escaped = _json_end(buf, scanned, depth, in_string, escaped)
+            if end != -1:
+                yield text[: end - scanned]
+                break
+            yield text
+    finally:
+        await stream.aclose()
+
+
+async def _generate(prompt: str, verdicts: int = 1) -> str:
+    """Run a JSON-mode Gemini request and return the raw response text."""
+    return "".join([text async for text in _stream_generate(prompt, verdicts)]).strip()
+
+
+def _claim_prompt(claim: str, sources: List[Dict[str, str]]) -> str:
+    """Build the single-claim analysis prompt."""
+    return _build_claim_prompt(claim, _source_key(sources))
+
+
+# Search results are cached per query, so a repeated claim usually arrives
+# with the same sources; reuse its prompt rather than rebuilding the string.
+@functools.lru_cache(maxsize=2048)
+def _build_claim_prompt(claim: str, sources: _SourceKey) -> str:
+    return f"""
+        Analyze the following text against the provided news sources.
+        
+        Claim to Verify: "{claim}"
+        
+        Search Results/Sources:
+        {_format_sources(sources)}
+        {_GUIDELINES}
         """
 
-        resp = _gemini_client.models.generate_content(
-            model="gemini-2.5-flash-lite",
-            contents=prompt,
-            config={"response_mime_type": "application/json"},
+
+async def _analyze_claim(claim: str, sources: List[Dict[str, str]]) -> Tuple[bool, str]:
+    """
+    Perform single-pass analysis using Gemini.
+    Asks for search query generation (if needed), verification, and explanation in one go
+    to reduce latency and API calls.
+    """
+    try:
+        return True, await _generate(_claim_prompt(claim, sources))
+    except Exception as exc:
+        logger.error("Gemini analysis error: %s", exc)
+        if _is_rate_limited(exc):
+            raise _upstream_rate_limited() from exc
+        return False, f"Gemini error: {type(exc).__name__}"
+
+
+async def _analyze_batch(
+    items: List[Tuple[str, List[Dict[str, str]]]]
+) -> Tuple[bool, List[Dict[str, Any]] | str]:
+    """
+    Analyze several claims with a single Gemini request.
+    Each claim is judged only against its own numbered sources, and the model
+    returns one verdict object per claim in the same order.
+    """
+    try:
+        blocks = "\n".join(
+            f"""
+        Claim {n}: "{claim}"
+        Sources for Claim {n}:
+        {_format_sources(_source_key(sources))}
+        """
+            for n, (claim, sources) in enumerate(items, start=1)
         )
-        return True, (resp.text or "").strip()
+
+        prompt = f"""
+        Analyze each numbered claim below against its own news sources.
+        Judge every claim independently; never use sources listed under another claim.
+        {blocks}
+        {_GUIDELINES}
+        Return one verdict per claim, in claim order, tagged with its claim_number.
+        """
+
+        results = orjson.loads(await _generate(prompt, verdicts=len(items)))
+        # The schema only fixes the array length; every claim must also be
+        # numbered exactly once, or a verdict would be stored under another claim.
+        if not isinstance(results, list) or sorted(
+            r.get("claim_number", 0) for r in results
+        ) != list(range(1, len(items) + 1)):
+            return False, "Gemini returned a malformed batch response"
+
+        results.sort(key=lambda r: r.get("claim_number", 0))
+        for r in results:
+            r.pop("claim_number", None)
+        return True, results
+    except Exception as exc:
+        logger.error("Gemini batch analysis error: %s", exc)
+        if _is_rate_limited(exc):
+            raise _upstream_rate_limited() from exc
+        return False, f"Gemini error: {type(exc).__name__}"
+
+
+def _unverifiable(search_query: str) -> Dict[str, Any]:
+    """Result returned when the search found nothing to check the claim against."""
+    return {
+        "verdict": "Unverifiable",
+        "explanation": "No relevant sources found to verify this claim.",
+        "confidence_score": 0,
+        "sources": [],
+        "search_query": search_query,
+    }
+
+
+def _parse_claims(data: Dict[str, Any], limit: int) -> Tuple[List[str], Optional[str]]:
+    """Validate the ``claims`` list of a multi-claim request."""
+    claims = data.get("claims")
+    if not isinstance(claims, list) or not claims:
+        return [], "Claims must be a non-empty list"
+    if len(claims) > limit:
+        return [], f"At most {limit} claims per request"
+    claims = [c.strip() if isinstance(c, str) else "" for c in claims]
+    if not all(claims):
+        return [], "Each claim must be a non-empty string"
+    if any(len(c) > _MAX_CLAIM_CHARS for c in claims):
+        return [], f"Each claim must be at most {_MAX_CLAIM_CHARS} characters"
+    return claims, None
+
+
+async def _save_job(job: Dict[str, Any]) -> None:
+    """Persist a bulk job record under its id."""
+    await cache_set(f"fnd:job:{job['id']}", orjson.dumps(job), _JOB_TTL)
+
+
+async def _semantic_lookup(claim: str) -> Tuple[Optional[bytes], Optional[np.ndarray]]:
+    """
+    Look up a cached response for a paraphrase of ``claim``.
+    Returns the cached body (or None) and the claim embedding, so a fresh
+    result can be indexed. Both are None when the semantic cache is off or
+    the embedder fails; detection then carries on uncached.
+    """
+    if not semantic.enabled():
+        return None, None
+    try:
+        vec = await semantic.embed(claim)
     except Exception as exc:
-        logger.error(f"Gemini analysis error: {exc}")
-        return False, f"Gemini error: {exc}"
+        logger.warning("Claim embedding failed: %s", exc)
+        return None, None
+    match = semantic.nearest(vec)
+    if match is None:
+        return None, vec
+    cached = await cache_get(match)
+    if cached is None:
+        # The response expired from Redis; stop matching against it
+        semantic.forget(match)
+    return cached, vec
+
+
+async def _store_response(key: str, body: bytes, vec: Optional[np.ndarray]) -> None:
+    """Cache a serialized result and index its claim embedding, if any."""
+    await cache_set(key, body, _RESPONSE_TTL)
+    if vec is not None:
+        semantic.remember(key, vec)
+
+
+async def _cached_response(
+    key: str, payload: Dict[str, Any], vec: Optional[np.ndarray] = None
+) -> Response:
+    """Serialize a detection result, store it in the cache and return it."""
+    body = orjson.dumps(payload)
+    await _store_response(key, body, vec)
+    return Response(body, mimetype="application/json", headers={"X-Cache": "MISS"})
+
+
+def _sse(event: str, data: Dict[str, Any] | bytes) -> bytes:
+    """Encode one server-sent event. orjson output never contains newlines."""
+    payload = data if isinstance(data, bytes) else orjson.dumps(data)
+    return b"event: " + event.encode() + b"\ndata: " + payload + b"\n\n"
 
 
 @detect_bp.post("/api/detect")
+@rate_limit(limits=_RATE_LIMITS)
 @login_required
-def detect():
+async def detect():
     """
     Main detection endpoint.
     Flow:
     1. Validate input
-    2. Search for information (using claim as query directly first)
+    2. Search for information (keyword query extracted locally)
     3. Analyze with AI
     4. Return structured result
+
+    Successful results are cached by the normalized claim, and repeated
+    claims are answered from the cache with an ``X-Cache: HIT`` header.
     """
     # 1. Initialize clients
     ok, err = _ensure_clients()
@@ -142,47 +619,53 @@ def detect():
         return jsonify({"error": err}), 500
 
     # 2. Parse input
-    data = request.get_json(silent=True) or {}
+    data = await request.get_json(silent=True) or {}
     claim = (data.get("claim") or "").strip()
     if not claim:
         return jsonify({"error": "Claim is required"}), 400
+    if len(claim) > _MAX_CLAIM_CHARS:
+        return jsonify({"error": f"Claim must be at most {_MAX_CLAIM_CHARS} characters"}), 400
+
+    key = cache_key("fnd:", claim)
+    cached = await cache_get(key)
+    if cached is not None:
+        return Response(cached, mimetype="application/json", headers={"X-Cache": "HIT"})
 
-    # 3. Search (using claim directly as query for simplicity/speed)
-    # In a more complex flow, we could ask AI to generate a query first,
-    # but for "one api call" requirement, we'll try to keep it streamlined.
-    ok, sources_or_err = _search_articles(claim)
+    cached, vec = await _semantic_lookup(claim)
+    if cached is not None:
+        return Response(cached, mimetype="application/json", headers={"X-Cache": "SEMANTIC"})
+
+    await _charge_claims(1)
+
+    # 3. Search with a locally extracted keyword query so the only model
+    # round-trip is the analysis call below.
+    search_query = _local_query(claim)
+    ok, sources_or_err = await _search_articles(search_query)
     if not ok:
         return jsonify({"error": sources_or_err}), 502
 
     sources: List[Dict[str, str]] = sources_or_err  # type: ignore
 
     if not sources:
-        return jsonify(
-            {
-                "verdict": "Unverifiable",
-                "explanation": "No relevant sources found to verify this claim.",
-                "confidence_score": 0,
-                "sources": [],
-            }
-        )
+        return await _cached_response(key, _unverifiable(search_query), vec)
 
     # 4. Analyze
-    ok, result_json = _analyze_claim(claim, sources)
+    ok, result_json = await _analyze_claim(claim, sources)
     if not ok:
         return jsonify({"error": result_json}), 502
 
     try:
         # Parse AI response
         # Gemini 2.0 Flash is good at returning JSON when requested
-        result = json.loads(result_json)
+        result = orjson.loads(result_json)
 
         # Add sources to the response for the frontend
         result["sources"] = sources
-        result["search_query"] = claim
+        result["search_query"] = search_query
 
-        return jsonify(result)
+        return await _cached_response(key, result, vec)
 
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         # Fallback if JSON parsing fails
         return (
             jsonify(
@@ -194,3 +677,333 @@ def detect():
             ),
             500,
         )
+
+
+@detect_bp.post("/api/detect_stream")
+@rate_limit(limits=_RATE_LIMITS)
+@login_required
+async def detect_stream():
+    """
+    Streaming variant of ``/api/detect`` using server-sent events.
+    Emits ``search`` once the query is built, ``sources`` after the search,
+    ``delta`` events carrying the verdict JSON text as Gemini generates it,
+    and a final ``result`` with the same body ``/api/detect`` returns.
+    Failures after the stream starts are sent as an ``error`` event.
+    """
+    ok, err = _ensure_clients()
+    if not ok:
+        return jsonify({"error": err}), 500
+
+    data = await request.get_json(silent=True) or {}
+    claim = (data.get("claim") or "").strip()
+    if not claim:
+        return jsonify({"error": "Claim is required"}), 400
+    if len(claim) > _MAX_CLAIM_CHARS:
+        return jsonify({"error": f"Claim must be at most {_MAX_CLAIM_CHARS} characters"}), 400
+
+    key = cache_key("fnd:", claim)
+
+    @stream_with_context
+    async def events():
+        cached = await cache_get(key)
+        if cached is None:
+            cached, vec = await _semantic_lookup(claim)
+        if cached is not None:
+            yield _sse("result", cached)
+            return
+
+        try:
+            await _charge_claims(1)
+        except RateLimitExceeded as exc:
+            yield _sse("error", {"error": exc.description, "retry_after": exc.retry_after})
+            return
+
+        search_query = _local_query(claim)
+        yield _sse("search", {"search_query": search_query})
+
+        try:
+            ok, sources_or_err = await _search_articles(search_query)
+        except RateLimitExceeded as exc:
+            yield _sse("error", {"error": exc.description, "retry_after": exc.retry_after})
+            return
+        if not ok:
+            yield _sse("error", {"error": sources_or_err})
+            return
+        sources: List[Dict[str, str]] = sources_or_err  # type: ignore
+        yield _sse("sources", {"sources": sources})
+
+        if not sources:
+            result = _unverifiable(search_query)
+        else:
+            parts = []
+            try:
+                async for text in _stream_generate(_claim_prompt(claim, sources)):
+                    parts.append(text)
+                    yield _sse("delta", {"text": text})
+                result = orjson.loads("".join(parts))
+            except orjson.JSONDecodeError:
+                yield _sse("error", {"error": "Failed to parse AI response"})
+                return
+            except Exception as exc:
+                logger.error("Gemini analysis error: %s", exc)
+                if _is_rate_limited(exc):
+                    err = _upstream_rate_limited()
+                    yield _sse("error", {"error": err.description, "retry_after": err.retry_after})
+                else:
+                    yield _sse("error", {"error": f"Gemini error: {type(exc).__name__}"})
+                return
+            result["sources"] = sources
+            result["search_query"] = search_query
+
+        body = orjson.dumps(result)
+        await _store_response(key, body, vec)
+        yield _sse("result", body)
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return Response(events(), mimetype="text/event-stream", headers=headers)
+
+
+@detect_bp.post("/api/detect_batch")
+@rate_limit(limits=_RATE_LIMITS)
+@login_required
+async def detect_batch():
+    """
+    Batch detection endpoint.
+    Cached claims are answered directly; the rest are searched concurrently
+    and analyzed together in one Gemini call. If the batch response cannot be
+    used, each claim falls back to its own analysis call.
+    Results are returned in the order the claims were given.
+    """
+    ok, err = _ensure_clients()
+    if not ok:
+        return jsonify({"error": err}), 500
+
+    data = await request.get_json(silent=True) or {}
+    claims, err = _parse_claims(data, _MAX_BATCH_CLAIMS)
+    if err:
+        return jsonify({"error": err}), 400
+
+    keys = [cache_key("fnd:", claim) for claim in claims]
+    results: List[Optional[Dict[str, Any]]] = [None] * len(claims)
+    pending = []
+    for i, cached in enumerate(await cache_get_many(keys)):
+        if cached is not None:
+            results[i] = orjson.loads(cached)
+        else:
+            pending.append(i)
+
+    await _charge_claims(len(pending))
+
+    queries = {i: _local_query(claims[i]) for i in pending}
+    searches = await asyncio.gather(*(_search_articles(queries[i]) for i in pending))
+
+    to_analyze: List[Tuple[int, List[Dict[str, str]]]] = []
+    for i, (ok, sources_or_err) in zip(pending, searches):
+        if not ok:
+            results[i] = {"error": sources_or_err}
+        elif not sources_or_err:
+            results[i] = _unverifiable(queries[i])
+            await cache_set(keys[i], orjson.dumps(results[i]), _RESPONSE_TTL)
+        else:
+            to_analyze.append((i, sources_or_err))  # type: ignore
+
+    if to_analyze:
+        # A lone claim goes straight to the single-claim call: the batch
+        # prompt and array schema only pay off for two or more claims.
+        ok = False
+        if len(to_analyze) > 1:
+            ok, verdicts = await _analyze_batch(
+                [(claims[i], sources) for i, sources in to_analyze]
+            )
+        if not ok:
+            verdicts = []
+            singles = await asyncio.gather(
+                *(_analyze_claim(claims[i], sources) for i, sources in to_analyze)
+            )
+            for ok, result_json in singles:
+                try:
+                    verdicts.append(
+                        orjson.loads(result_json) if ok else {"error": result_json}
+                    )
+                except orjson.JSONDecodeError:
+                    verdicts.append({"error": "Failed to parse AI response"})
+
+        for (i, sources), verdict in zip(to_analyze, verdicts):
+            if "error" not in verdict:
+                verdict["sources"] = sources
+                verdict["search_query"] = queries[i]
+                await cache_set(keys[i], orjson.dumps(verdict), _RESPONSE_TTL)
+            results[i] = verdict
+
+    return jsonify(
+        {"results": [{"claim": c, **r} for c, r in zip(claims, results)]}
+    )
+
+
+@detect_bp.post("/api/detect_bulk")
+@rate_limit(limits=_RATE_LIMITS)
+@login_required
+async def detect_bulk():
+    """
+    Bulk detection endpoint for non-interactive sweeps.
+    Searches run concurrently at submission time; the analyses are submitted
+    as one Gemini Batch Mode job, which is billed at a discount but finishes
+    asynchronously. Returns a job id to poll via ``GET /api/detect_bulk/<id>``.
+    """
+    ok, err = _ensure_clients()
+    if not ok:
+        return jsonify({"error": err}), 500
+    if get_cache() is None:
+        return jsonify({"error": "REDIS_URL is required for bulk jobs"}), 503
+
+    data = await request.get_json(silent=True) or {}
+    claims, err = _parse_claims(data, _MAX_BULK_CLAIMS)
+    if err:
+        return jsonify({"error": err}), 400
+
+    # Claims already answered are not searched or billed again; a None
+    # result marks a claim whose verdict will come from the batch job.
+    keys = [cache_key("fnd:", claim) for claim in claims]
+    cached = await cache_get_many(keys)
+    results: List[Optional[Dict[str, Any]]] = [
+        orjson.loads(body) if body is not None else None for body in cached
+    ]
+    pending = [i for i, body in enumerate(cached) if body is None]
+
+    await _charge_claims(len(pending))
+
+    queries = [_local_query(claim) for claim in claims]
+    # Keep the fan-out within the same bound as interactive batches
+    limit = asyncio.Semaphore(_MAX_BATCH_CLAIMS)
+    throttled: List[RateLimitExceeded] = []
+
+    async def search(query: str):
+        async with limit:
+            # Once Tavily has rejected us for quota, stop spending it on the
+            # searches still queued; those claims report the same 429.
+            if throttled:
+                raise throttled[0]
+            try:
+                return await _search_articles(query)
+            except RateLimitExceeded as exc:
+                throttled.append(exc)
+                raise
+
+    searches = await asyncio.gather(
+        *(search(queries[i]) for i in pending), return_exceptions=True
+    )
+
+    sources: List[List[Dict[str, str]]] = [[] for _ in claims]
+    batch_requests = []
+    for i, outcome in zip(pending, searches):
+        if isinstance(outcome, RateLimitExceeded):
+            results[i] = {"error": outcome.description, "retry_after": outcome.retry_after}
+            continue
+        if isinstance(outcome, BaseException):
+            raise outcome
+        ok, sources_or_err = outcome
+        if not ok:
+            results[i] = {"error": sources_or_err}
+        elif not sources_or_err:
+            results[i] = _unverifiable(queries[i])
+            await cache_set(keys[i], orjson.dumps(results[i]), _RESPONSE_TTL)
+        else:
+            sources[i] = sources_or_err  # type: ignore
+            batch_requests.append(
+                {
+                    "contents": _claim_prompt(claims[i], sources_or_err),  # type: ignore
+                    "config": _generation_config(),
+                }
+            )
+
+    batch_name = None
+    if batch_requests:
+        try:
+            batch = await _gemini_client.aio.batches.create(model=_MODEL, src=batch_requests)
+            batch_name = batch.name
+        except Exception as exc:
+            logger.error("Gemini batch submission error: %s", exc)
+            if _is_rate_limited(exc):
+                raise _upstream_rate_limited() from exc
+            return jsonify({"error": f"Gemini error: {type(exc).__name__}"}), 502
+
+    job = {
+        "id": uuid.uuid4().hex,
+        "user_id": g.user["id"],
+        "batch": batch_name,
+        "status": "pending" if batch_name else "done",
+        "claims": claims,
+        "queries": queries,
+        "sources": sources,
+        "results": results,
+    }
+    await _save_job(job)
+    return jsonify({"id": job["id"], "status": job["status"]}), 202
+
+
+@detect_bp.get("/api/detect_bulk/<job_id>")
+@rate_limit(limits=_POLL_LIMITS)
+@login_required
+async def detect_bulk_status(job_id: str):
+    """
+    Report a bulk job. While the batch is pending this polls Gemini once;
+    when it has finished the verdicts are stored on the job and each one is
+    also written to the response cache used by ``/api/detect``.
+    """
+    ok, err = _ensure_clients()
+    if not ok:
+        return jsonify({"error": err}), 500
+
+    cached = await cache_get(f"fnd:job:{job_id}")
+    job = orjson.loads(cached) if cached is not None else None
+    if job is None or job["user_id"] != g.user["id"]:
+        return jsonify({"error": "Job not found"}), 404
+
+    if job["status"] == "pending":
+        try:
+            batch = await _gemini_client.aio.batches.get(name=job["batch"])
+        except Exception as exc:
+            logger.error("Gemini batch lookup error: %s", exc)
+            if _is_rate_limited(exc):
+                raise _upstream_rate_limited() from exc
+            return jsonify({"error": f"Gemini error: {type(exc).__name__}"}), 502
+
+        if batch.state in _JOB_FAILED_STATES:
+            reason = f"Batch job ended in state {batch.state.value}"
+            job["results"] = [r or {"error": reason} for r in job["results"]]
+            job["status"] = "failed"
+            await _save_job(job)
+        elif batch.state in _JOB_DONE_STATES:
+            responses = iter(batch.dest.inlined_responses or [])
+            for i, result in enumerate(job["results"]):
+                if result is not None:
+                    continue
+                inlined = next(responses, None)
+                if inlined is not None and inlined.error is not None:
+                    job["results"][i] = {
+                        "error": f"Gemini error {inlined.error.code}: {inlined.error.message}"
+                    }
+                    continue
+                try:
+                    verdict = orjson.loads(inlined.response.text)
+                except Exception:
+                    job["results"][i] = {"error": "Failed to parse AI response"}
+                    continue
+                verdict["sources"] = job["sources"][i]
+                verdict["search_query"] = job["queries"][i]
+                await cache_set(
+                    cache_key("fnd:", job["claims"][i]), orjson.dumps(verdict), _RESPONSE_TTL
+                )
+                job["results"][i] = verdict
+            job["status"] = "done"
+            await _save_job(job)
+
+    return jsonify(
+        {
+            "id": job["id"],
+            "status": job["status"],
+            "results": [
+                {"claim": c, **(r or {})} for c, r in zip(job["claims"], job["results"])
+            ],
+        }
+    )
@@ -7,9 +7,10 @@ bind = f"0.0.0.0:{os.getenv('PORT', 8000)}"
 backlog = 2048
 
 # Worker processes
-workers = multiprocessing.cpu_count() * 2 + 1
-worker_class = "sync"
-worker_connections = 1000
+# Each ASGI worker runs an event loop that keeps many requests in flight while
+# they wait on Gemini/Tavily, so one worker per core is enough.
+workers = multiprocessing.cpu_count()
+worker_class = "uvicorn_worker.UvicornWorker"
 timeout = 30
 keepalive = 2
 
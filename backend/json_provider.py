@@ -0,0 +1,20 @@
+from typing import Any
+
+import orjson
+from quart import Response
+from quart.json.provider import JSONProvider
+
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson, used by ``jsonify`` and ``request.get_json``."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        # Hand orjson's bytes straight to the response, skipping the str round-trip
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype="application/json")
@@ -0,0 +1,68 @@
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+from quart import current_app
+
+_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+# Per-worker index size; the oldest entries are evicted first
+_MAX_ENTRIES = 2048
+
+# Global embedder (lazy initialized, loads an ONNX model on first use)
+_embedder = None
+# Inference runs on worker threads; two first requests must not both load the model
+_embedder_lock = threading.Lock()
+# Response cache key -> unit-length claim embedding, in least-recently-used order
+_index: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+
+def enabled() -> bool:
+    """Semantic lookups run only when a similarity threshold is configured."""
+    return current_app.config.get("SEMANTIC_CACHE_THRESHOLD") is not None
+
+
+def _embed(text: str) -> np.ndarray:
+    global _embedder
+    if _embedder is None:
+        with _embedder_lock:
+            if _embedder is None:
+                # Imported here: fastembed (and onnxruntime) is an optional
+                # dependency that is only needed when the feature is on
+                from fastembed import TextEmbedding
+
+                _embedder = TextEmbedding(_MODEL_NAME)
+    vec = next(iter(_embedder.embed([text])))
+    return vec / np.linalg.norm(vec)
+
+
+async def embed(text: str) -> np.ndarray:
+    """Embed a claim off the event loop; inference is CPU-bound."""
+    return await asyncio.to_thread(_embed, text)
+
+
+def nearest(vec: np.ndarray) -> Optional[str]:
+    """Return the cache key of the closest indexed claim above the threshold."""
+    if not _index:
+        return None
+    keys = list(_index)
+    scores = np.stack(list(_index.values())) @ vec
+    best = int(np.argmax(scores))
+    if scores[best] < current_app.config["SEMANTIC_CACHE_THRESHOLD"]:
+        return None
+    _index.move_to_end(keys[best])
+    return keys[best]
+
+
+def remember(key: str, vec: np.ndarray) -> None:
+    """Index a claim embedding under its response cache key."""
+    _index[key] = vec
+    _index.move_to_end(key)
+    while len(_index) > _MAX_ENTRIES:
+        _index.popitem(last=False)
+
+
+def forget(key: str) -> None:
+    """Drop an entry whose cached response has expired."""
+    _index.pop(key, None)